@@ -15,26 +15,236 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
-import numpy as np
-from ctypes import cdll
-lib_sde_markers = cdll.LoadLibrary('./libsde_markers.so')
+import operator
+import os
+import sys
+from contextlib import contextmanager
+from itertools import repeat
+from ctypes import PYFUNCTYPE, POINTER, PyDLL, byref, c_double, c_float
 
-a = np.float64(1)
-b = np.float64(1)
-c = np.float64(1)
+# Note: PyDLL (and PYFUNCTYPE prototypes) do not release the GIL for the
+# calls, which saves instructions around the markers. This is only safe
+# because the functions of the library are short and neither block nor
+# call back into Python.
+lib_sde_markers = PyDLL('./libsde_markers.so')
 
-x = np.float32(1)
-y = np.float32(1)
-z = np.float32(1)
+# Bind the functions once via their prototypes. Calls then neither look up
+# the function on the library object nor guess (and convert) arguments and
+# return values.
+_marker_proto = PYFUNCTYPE(None)
+_kernel_proto = PYFUNCTYPE(None,
+                           POINTER(c_double), POINTER(c_double),
+                           POINTER(c_double), POINTER(c_float),
+                           POINTER(c_float), POINTER(c_float))
+_start = _marker_proto(('sde_start_marker', lib_sde_markers))
+_stop = _marker_proto(('sde_stop_marker', lib_sde_markers))
+_kernel = _kernel_proto(('sde_flops_kernel', lib_sde_markers))
+_kernel_unmarked = _kernel_proto(('sde_flops_kernel_unmarked',
+                                  lib_sde_markers))
+_fma_kernel = _kernel_proto(('sde_fma_kernel', lib_sde_markers))
+_fma_kernel_unmarked = _kernel_proto(('sde_fma_kernel_unmarked',
+                                      lib_sde_markers))
 
-c = a + b
-z = x * y
 
-lib_sde_markers.sde_start_marker() # only count the two following lines...
-a = b + c # one double precision FLOP
-x = y * z # one single precision FLOP
-lib_sde_markers.sde_stop_marker()
+@contextmanager
+def _quiet_profilers():
+    """Disable profiling and tracing hooks (e.g. cProfile, coverage) so that
+    they do not add instructions to the section between the markers"""
+    monitoring = getattr(sys, 'monitoring', None) # Python 3.12+ (PEP 669)
+    if (monitoring is not None and
+            monitoring.get_tool(monitoring.PROFILER_ID) is None):
+        monitoring = None # no profiler registered, nothing to disable
+    if monitoring is not None:
+        events = monitoring.get_events(monitoring.PROFILER_ID)
+        monitoring.set_events(monitoring.PROFILER_ID, 0)
+    profiler = sys.getprofile()
+    tracer = sys.gettrace()
+    if hasattr(profiler, 'disable'): # cProfile prior to Python 3.12
+        profiler.disable()
+    else:
+        sys.setprofile(None)
+    sys.settrace(None)
+    try:
+        yield
+    finally:
+        sys.settrace(tracer)
+        if hasattr(profiler, 'disable'):
+            profiler.enable()
+        else:
+            sys.setprofile(profiler)
+        if monitoring is not None:
+            monitoring.set_events(monitoring.PROFILER_ID, events)
 
-c = a + b
-z = x * y
 
+def measure(func, args=(), reps=1000000):
+    """Call func(*args) reps times between a single pair of markers
+
+    The overhead of the markers (and the loop) is amortized over all calls.
+    Divide the counts reported by intel_sde_flops.py by reps to get them per
+    call of func."""
+    with _quiet_profilers():
+        _start()
+        for _ in repeat(None, reps):
+            func(*args)
+        _stop()
+
+
+# Number of elements processed by the vectorized examples
+N = 4096
+
+# Number of times the examples are run before measuring them. This warms up
+# caches and TLBs so that the counted section only sees the steady state.
+WARMUP = 1000
+
+
+def _aligned_operands():
+    """Allocate the operands of the vectorized examples as separate arrays
+    of N elements (a, b, c in double and x, y, z in single precision). Each
+    is contiguous and aligned to 64 bytes (size of a cache line and of an
+    AVX-512 register), so full-width aligned SIMD loads/stores can be used."""
+    import numpy as np
+
+    def aligned_empty(dtype, alignment=64):
+        dtype = np.dtype(dtype)
+        nbytes = N * dtype.itemsize
+        buf = np.empty(nbytes + alignment, dtype=np.uint8)
+        offset = -buf.ctypes.data % alignment
+        return buf[offset:offset + nbytes].view(dtype)
+
+    operands = []
+    for dtype in (np.float64, np.float64, np.float64,
+                  np.float32, np.float32, np.float32):
+        arr = aligned_empty(dtype)
+        arr[:] = 1
+        operands.append(arr)
+    return operands
+
+
+def scalar_example():
+    "Compute one double and one single precision FLOP"
+    a = c_double(1)
+    b = c_double(1)
+    c = c_double(1)
+
+    x = c_float(1)
+    y = c_float(1)
+    z = c_float(1)
+
+    c.value = a.value + b.value
+    z.value = x.value * y.value
+
+    # The markers are placed inside the kernel around the two FLOPs, so only
+    # a single call crosses the Python/C boundary. Convert the arguments up
+    # front.
+    kernel_args = (byref(a), byref(b), byref(c), byref(x), byref(y), byref(z))
+    for _ in range(WARMUP):
+        _kernel_unmarked(*kernel_args)
+    with _quiet_profilers():
+        _kernel(*kernel_args) # one double and one single precision FLOP
+
+    c.value = a.value + b.value
+    z.value = x.value * y.value
+
+
+def fma_example():
+    "Compute one double and one single precision FMA (two FLOPs each)"
+    a = c_double(1)
+    b = c_double(1)
+    c = c_double(1)
+
+    x = c_float(1)
+    y = c_float(1)
+    z = c_float(1)
+
+    # Same as for scalar_example(), with a = b * c + a and x = y * z + x
+    kernel_args = (byref(a), byref(b), byref(c), byref(x), byref(y), byref(z))
+    for _ in range(WARMUP):
+        _fma_kernel_unmarked(*kernel_args)
+    with _quiet_profilers():
+        _fma_kernel(*kernel_args) # two double and two single precision FLOPs
+
+
+def python_example():
+    "Compute one million double precision FLOPs with Python floats"
+    # Each call of operator.add() computes one double precision FLOP, but also
+    # executes a lot of instructions of the interpreter
+    add = operator.add
+    for _ in range(WARMUP):
+        add(1.0, 1.0)
+    measure(add, (1.0, 1.0))
+
+
+def numpy_example():
+    "Compute N double and N single precision FLOPs with NumPy ufuncs"
+    import numpy as np
+
+    # Local names avoid global and attribute lookups between the markers
+    add = np.add
+    multiply = np.multiply
+
+    # Arrays need to be large enough for NumPy to use its SIMD loops
+    a, b, c, x, y, z = _aligned_operands()
+
+    # Warm up caches (and NumPy's dispatch) outside of the markers
+    for _ in range(WARMUP):
+        add(b, c, out=a)
+        multiply(y, z, out=x)
+
+    # The results are written to the existing arrays ('out'), so no new
+    # objects are created between the markers.
+    with _quiet_profilers():
+        _start() # only count the two following lines...
+        add(b, c, out=a) # N double precision FLOPs
+        multiply(y, z, out=x) # N single precision FLOPs
+        _stop()
+
+
+def numba_example():
+    "Compute N double and N single precision FLOPs with SIMD instructions"
+    from numba import njit
+
+    @njit(fastmath=True, boundscheck=False)
+    def kern(a, b, c, x, y, z):
+        for i in range(a.size):
+            a[i] = b[i] + c[i]
+            x[i] = y[i] * z[i]
+
+    # The markers are called from compiled code, too. Hence, no Python or
+    # ctypes instructions are executed between them.
+    @njit
+    def measured_kern(a, b, c, x, y, z):
+        _start() # only count the kernel...
+        kern(a, b, c, x, y, z) # N double and N single precision FLOPs
+        _stop()
+
+    a, b, c, x, y, z = _aligned_operands()
+
+    # Compile (and run) the kernel outside of the markers. The measured
+    # version is only compiled since running it would be counted.
+    for _ in range(WARMUP):
+        kern(a, b, c, x, y, z)
+    measured_kern.compile(kern.signatures[0])
+    # Packed adds are (v)addpd, scalar ones (v)addsd
+    if 'addpd' not in kern.inspect_asm(kern.signatures[0]):
+        print("Warning: Kernel was not vectorized!")
+
+    with _quiet_profilers():
+        measured_kern(a, b, c, x, y, z)
+
+
+# Stay on one core so that the measured sections are not migrated
+if hasattr(os, 'sched_setaffinity'):
+    os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+
+EXAMPLES = {
+    'scalar': scalar_example,
+    'fma': fma_example,
+    'python': python_example,
+    'numpy': numpy_example,
+    'numba': numba_example,
+}
+
+if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] not in EXAMPLES):
+    print("Usage:\npython %s [%s]" % (sys.argv[0], '|'.join(sorted(EXAMPLES))))
+    sys.exit(1)
+EXAMPLES[sys.argv[1] if len(sys.argv) == 2 else 'scalar']()
@@ -13,6 +13,72 @@ void sde_stop_marker(void)
     __SSC_MARK(0xDEAD);
 }
 
+// Exactly one scalar addition/multiplication, regardless of the compiler
+// (options) used
+static inline __attribute__((always_inline))
+double one_dp_flop(double b, double c)
+{
+    __asm__ __volatile__("addsd %1, %0" : "+x"(b) : "x"(c));
+    return b;
+}
+
+static inline __attribute__((always_inline))
+float one_sp_flop(float y, float z)
+{
+    __asm__ __volatile__("mulss %1, %0" : "+x"(y) : "x"(z));
+    return y;
+}
+
+// Exactly one scalar FMA (a = b * c + a), which is counted as two FLOPs.
+// Note: Requires a processor with FMA support (e.g. sde64 -hsw or newer).
+static inline __attribute__((always_inline))
+double one_dp_fma(double a, double b, double c)
+{
+    __asm__ __volatile__("vfmadd231sd %2, %1, %0" : "+x"(a) : "x"(b), "x"(c));
+    return a;
+}
+
+static inline __attribute__((always_inline))
+float one_sp_fma(float x, float y, float z)
+{
+    __asm__ __volatile__("vfmadd231ss %2, %1, %0" : "+x"(x) : "x"(y), "x"(z));
+    return x;
+}
+
+void sde_flops_kernel(double *a, const double *b, const double *c,
+                      float *x, const float *y, const float *z)
+{
+    __SSC_MARK(0xFACE);
+    *a = one_dp_flop(*b, *c); // one double precision FLOP
+    *x = one_sp_flop(*y, *z); // one single precision FLOP
+    __SSC_MARK(0xDEAD);
+}
+
+// Same as sde_flops_kernel() but without markers (e.g. for warm-up)
+void sde_flops_kernel_unmarked(double *a, const double *b, const double *c,
+                               float *x, const float *y, const float *z)
+{
+    *a = one_dp_flop(*b, *c);
+    *x = one_sp_flop(*y, *z);
+}
+
+void sde_fma_kernel(double *a, const double *b, const double *c,
+                    float *x, const float *y, const float *z)
+{
+    __SSC_MARK(0xFACE);
+    *a = one_dp_fma(*a, *b, *c); // two double precision FLOPs
+    *x = one_sp_fma(*x, *y, *z); // two single precision FLOPs
+    __SSC_MARK(0xDEAD);
+}
+
+// Same as sde_fma_kernel() but without markers (e.g. for warm-up)
+void sde_fma_kernel_unmarked(double *a, const double *b, const double *c,
+                             float *x, const float *y, const float *z)
+{
+    *a = one_dp_fma(*a, *b, *c);
+    *x = one_sp_fma(*x, *y, *z);
+}
+
 #ifdef __cplusplus
 }
 #endif
@@ -12,6 +12,16 @@ extern "C" {
 
 extern void sde_start_marker(void);
 extern void sde_stop_marker(void);
+extern void sde_flops_kernel(double *a, const double *b, const double *c,
+                             float *x, const float *y, const float *z);
+extern void sde_flops_kernel_unmarked(double *a, const double *b,
+                                      const double *c, float *x,
+                                      const float *y, const float *z);
+extern void sde_fma_kernel(double *a, const double *b, const double *c,
+                           float *x, const float *y, const float *z);
+extern void sde_fma_kernel_unmarked(double *a, const double *b,
+                                    const double *c, float *x,
+                                    const float *y, const float *z);
 
 
 #ifdef __cplusplus
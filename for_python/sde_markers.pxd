@@ -0,0 +1,20 @@
+# Cython declarations of the Intel SDE markers (see sde_markers.h)
+#
+# Author: Georg Zitzlsberger (georg.zitzlsberger<ad>vsb.cz)
+# Copyright (C) 2019 Georg Zitzlsberger, IT4Innovations,
+#                    VSB-Technical University of Ostrava, Czech Republic
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+cdef extern from "sde_markers.h":
+    void sde_start_marker() nogil
+    void sde_stop_marker() nogil
@@ -39,11 +39,78 @@ History:
 - 1.0: Initial version (never labled like that)
 """
 
+import hashlib
+import os
+import pickle
 import re
 import sys
 
 __version__ = "1.1"
 
+# Buffer size for reading the (large) output files of Intel SDE sequentially
+READ_BUFFER_SIZE = 1 << 20
+
+# States when reading the output of Intel SDE's '-mix' option
+MIX_SEARCH_TID = 0  # Outside of a thread's statistics
+MIX_IN_THREAD = 1  # Before line "# $dynamic-counts" of a thread
+MIX_IN_DYN_COUNTS = 2  # Before line "# iform count" of a thread
+MIX_IN_IFORM = 3  # Instruction groups and counts of a thread
+
+# States when reading the output of Intel SDE's '-dyn_mask_profile' option
+DYN_SEARCH_THREAD = 0  # Outside of a thread
+DYN_IN_THREAD = 1  # Inside of a thread, outside of the blocks below
+DYN_IN_SUMMARY = 2  # Between lines "<summarytable>" and "</summarytable>"
+DYN_IN_IDET = 3  # Inside of a thread's instruction details
+
+# Regular expressions for the output of Intel SDE's '-mix' option
+RE_MIX_TID = re.compile(br'^# EMIT_DYNAMIC_STATS FOR TID\s+([0-9]+)\s+'
+                        br'OS-TID\s+([0-9]+)\s+EMIT')
+RE_MIX_IFORM = re.compile(br'#\s+iform\s+count')
+
+# Regular expressions for the output of Intel SDE's '-dyn_mask_profile' option
+RE_DYN_THREAD_NUMBER = re.compile(br'\s+<thread-number>\s+([0-9]+)\s+'
+                                  br'</thread-number>')
+RE_DYN_MASKED_FP = re.compile(br'^\s+masked\s+mask\s+[0-9]+b\s+[0-9]+elem\s+'
+                              br'([0-9]+)b\s+fp\s+[|]\s+[0-9]+\s+([0-9]+)\s+'
+                              br'[0-9.]+\r?$')
+RE_DYN_COMP_COUNT = re.compile(br'\s+<computation-count>\s+([0-9]+)\s+')
+RE_DYN_EXEC_COUNT = re.compile(br'\s+<execution-counts>\s+([0-9]+)\s+')
+# FMA (1), 4FMA (2) or DPBF16 (3) instruction, as indicated by 'lastindex'
+RE_DYN_FP_DISASM = re.compile(br'\s+<disassembly>\s+'
+                              br'(?:(vf(?:m|nm)(?:add|sub)[0-9a-z]+)|'
+                              br'(v4f(?:m|nm)add[a-z]+)|'
+                              br'(vdpbf16[a-z]+))\s+')
+
+# Instruction groups of general FP from the output of Intel SDE's '-mix'
+# option, with the number of elements processed by a single execution
+# (bytes do not support '%' formatting prior to Python 3.5)
+ELEMENTS_FP_DOUBLE = tuple((('*elements_fp_double_%d' % cnt).encode('ascii'),
+                            cnt) for cnt in (1, 2, 4, 8))
+ELEMENTS_FP_SINGLE = tuple((('*elements_fp_single_%d' % cnt).encode('ascii'),
+                            cnt) for cnt in (1, 2, 4, 8, 16))
+
+# FMA instructions (iforms) from the output of Intel SDE's '-mix' option, e.g.
+# "VFMADD231PD_YMMqq_YMMqq_MEMqq": Type (PD, PS, SD or SS; VFMADDSUB and
+# VFMSUBADD are packed only), and the first and second operand (the third one
+# is either a register or memory)
+# Note: AVX512 FMAs are all only masked versions which will be taken care of
+#       by the function "flops_dyn" properly (using "comp_count")
+RE_MIX_FMA = re.compile(br'^VF(?:N?M(?:ADD|SUB)|M(?:ADDSUB|SUBADD)'
+                        br'(?=\d{3}P))(?:132|213|231)'
+                        br'(PD|PS|SD|SS)_(XMMdq|YMMqq)_'
+                        br'((XMM|YMM)(dq|qq|q|d))_(?:\4|MEM)\5$')
+
+# Double and single precision FLOPs of a single execution of an FMA instruction
+# by type, first and second operand
+FMA_FLOPS = {
+    (b'PD', b'XMMdq', b'XMMdq'): (2, 0),
+    (b'PD', b'YMMqq', b'YMMqq'): (4, 0),
+    (b'SD', b'XMMdq', b'XMMq'): (1, 0),
+    (b'PS', b'XMMdq', b'XMMdq'): (0, 4),
+    (b'PS', b'YMMqq', b'YMMqq'): (0, 8),
+    (b'SS', b'XMMdq', b'XMMd'): (0, 1),
+}
+
 def usage():
     print("Usage:\npython %s [<sde_mix_out> <sde_dyn_mask_profile>]\n" %  sys.argv[0])
     print("If no arguments are used, defaults are:")
@@ -56,526 +123,273 @@ def usage():
           "respectively.")
 
 
-def flops_mix(mix_file):
-    "Calculate the double/single FLOPS indicated in 'mix_file'"
-    lines = []
+def open_sde_file(sde_file):
+    "Open 'sde_file' for reading, or exit if it does not exist"
     try:
-        with open(mix_file, 'rt') as in_file:
-            for line in in_file:
-                lines.append(line)
+        return open(sde_file, 'rb', READ_BUFFER_SIZE)
     except:
-        print("Error: File '%s' does not exist!\n" % mix_file)
+        print("Error: File '%s' does not exist!\n" % sde_file)
         usage()
         exit(1)
 
+
+def wrong_sde_file(sde_file, option):
+    "Exit since 'sde_file' was not created with Intel SDE's 'option'"
+    print("Error: File '%s' does not seem to be created from Intel SDE's "
+          "'%s' option!\n" % (sde_file, option))
+    usage()
+    exit(1)
+
+
+def flops_mix(mix_file):
+    "Calculate the double/single FLOPS indicated in 'mix_file'"
+    in_file = open_sde_file(mix_file)
+
+    # FMA FLOPs by instruction group, each one classified only once for all
+    # threads (None if not an FMA)
+    fma_flops_by_iform = {}
+
+    # Read the instruction groups and counts of all threads in a single pass,
+    # only keeping those of the current thread
+    result = []
+    is_mix_file = False
+    state = MIX_SEARCH_TID
+    # Current thread, reset at its start line
+    tid = -1
+    os_tid = -1
+    instruction_group_count = {}
+    with in_file:
+        for line in in_file:
+            if state == MIX_SEARCH_TID:
+                # Find start line for thread
+                if line.startswith(b'# EMIT_DYNAMIC_STATS FOR TID'):
+                    is_mix_file = True
+                    mobj = RE_MIX_TID.match(line)
+                    if mobj:
+                        tid = int(mobj.group(1))
+                        os_tid = int(mobj.group(2))
+                        instruction_group_count = {}
+                        state = MIX_IN_THREAD
+            elif line.startswith(b'# END_DYNAMIC_STATS'):
+                # End line for thread
+                if state == MIX_IN_THREAD:
+                    # No line "# $dynamic-counts", ignore remaining threads
+                    state = MIX_SEARCH_TID
+                    break
+                if state == MIX_IN_DYN_COUNTS:
+                    # No line "# iform count" (SDE did not use -iform)
+                    wrong_sde_file(mix_file, '-iform')
+                result.append(flops_mix_thread(tid, os_tid,
+                                               instruction_group_count,
+                                               fma_flops_by_iform))
+                state = MIX_SEARCH_TID
+            elif state == MIX_IN_THREAD:
+                # Find line "# $dynamic-counts"
+                if (line.startswith(b'# $dynamic-counts') and
+                        line.rstrip(b'\r\n') == b'# $dynamic-counts'):
+                    state = MIX_IN_DYN_COUNTS
+            elif state == MIX_IN_DYN_COUNTS:
+                # Find line "# iform count"
+                if line.startswith(b'#') and RE_MIX_IFORM.match(line):
+                    state = MIX_IN_IFORM
+            elif not line.startswith(b'#'):  # state == MIX_IN_IFORM
+                # Read the instruction groups and counts
+                fields = line.split()
+                if len(fields) == 2 and fields[1].isdigit():
+                    instruction_group_count[fields[0]] = int(fields[1])
+
     # Brief validity check whether it's the correct file type...
-    if not any(re.match(r'^# EMIT_DYNAMIC_STATS FOR TID', line)
-               for line in lines):
-        print("Error: File '%s' does not seem to be created from Intel SDE's "
-              "'-mix' option!\n" % mix_file)
-        usage()
+    if not is_mix_file:
+        wrong_sde_file(mix_file, '-mix')
+
+    if state != MIX_SEARCH_TID:
+        print("Error: END_DYNAMIC_STATS not found!")
         exit(1)
 
-    tid_end = -1
-    result = []
-    while True:  # iterate over all threads
-        tid = -1
-        os_tid = -1
-        # Find start line for thread (tid_start)
-        tid_start = -1
-        for i in range(tid_end, len(lines)):
-            mobj = re.match(r'^# EMIT_DYNAMIC_STATS FOR TID\s+([0-9]+)\s'
-                            r'+OS-TID\s+([0-9]+)\s+EMIT', lines[i])
-            if mobj:
-                tid_start = i
-                tid = int(mobj.group(1))
-                os_tid = int(mobj.group(2))
-                break
-        if (tid_start == -1):
-            break
-
-        # Find end line for thread (tid_end)
-        old_tid_end = tid_end
-        for i in range(tid_start, len(lines)):
-            mobj = re.match(r'# END_DYNAMIC_STATS', lines[i])
-            if mobj:
-                tid_end = i
-                break
-        if (old_tid_end == tid_end):
-            print("Error: END_DYNAMIC_STATS not found!")
-            exit(1)
-
-        # Find line "# $dynamic-counts"
-        gdc_line = -1  # zero-based!
-        for i in range(tid_start, tid_end):
-            mobj = re.match(r'# \$dynamic-counts$', lines[i])
-            if mobj:
-                gdc_line = i
-                break
-        if gdc_line == -1:
-            break
-
-        # Find line "# iform count" (if not there, SDE did not use -iform)
-        iform_line = -1  # zero-based!
-        for i in range(gdc_line, tid_end):
-            mobj = re.match(r'#\s+iform\s+count', lines[i])
-            if mobj:
-                iform_line = i
-                break
-        if iform_line == -1:
-            print("Error: File '%s' does not seem to be created from Intel "
-                  "SDE's '-iform' option!\n" % mix_file)
-            usage()
-            exit(1)
-
-        # Read the instruction groups and counts
-        instruction_group_count = {}
-        for i in range(iform_line, tid_end):
-            mobj = re.match(r'^([*a-zA-Z0-9-_]+)\s+([0-9]+)$', lines[i])
-            if mobj:
-                instruction_group_count[mobj.group(1)] = eval(mobj.group(2))
-
-        # Compute FLOPs below...
-        total_fmas = 0
-        total_single_fp = 0
-        total_double_fp = 0
-
-        # General FP (*elements_fp_[double|single]_[1|2|4|8|16])
-        for cnt in [1, 2, 4, 8]:
-            key = '*elements_fp_double_' + str(cnt)
-            if key in instruction_group_count:
-                total_double_fp += instruction_group_count[key] * cnt
-        for cnt in [1, 2, 4, 8, 16]:
-            key = '*elements_fp_single_' + str(cnt)
-            if key in instruction_group_count:
-                total_single_fp += instruction_group_count[key] * cnt
-
-        # Get total executed instructions...
-        total_inst = 0
-        key = '*total'
-        if key in instruction_group_count:
-            total_inst = instruction_group_count[key]
+    return result
 
-        # Get bytes written...
-        total_written = 0
-        key = '*mem-write'
-        if key in instruction_group_count:
-            total_written = instruction_group_count[key]
 
-        # Get bytes read...
-        total_read = 0
-        key = '*mem-read'
+def flops_mix_thread(tid, os_tid, instruction_group_count,
+                     fma_flops_by_iform):
+    "Calculate the double/single FLOPS of a thread from its instruction groups"
+    # Compute FLOPs below...
+    total_fmas = 0
+    total_single_fp = 0
+    total_double_fp = 0
+
+    # General FP (*elements_fp_[double|single]_[1|2|4|8|16])
+    for key, cnt in ELEMENTS_FP_DOUBLE:
         if key in instruction_group_count:
-            total_read = instruction_group_count[key]
-
-        # FMAs
-        # Note: AVX512 FMAs are all only masked versions which will be taken
-        #       care of by the function "flops_masked" properly (using
-        #       "comp_count")
-        fma_double_xmm = [
-            'VFMADD132PD_XMMdq_XMMdq_MEMdq',
-            'VFMADD132PD_XMMdq_XMMdq_XMMdq',
-            'VFMADD213PD_XMMdq_XMMdq_MEMdq',
-            'VFMADD213PD_XMMdq_XMMdq_XMMdq',
-            'VFMADD231PD_XMMdq_XMMdq_MEMdq',
-            'VFMADD231PD_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB132PD_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB132PD_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB213PD_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB213PD_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB231PD_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB231PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUB132PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUB132PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUB213PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUB213PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUB231PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUB231PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD132PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD132PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD213PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD213PD_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD231PD_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD231PD_XMMdq_XMMdq_XMMdq',
-            'VFNMADD132PD_XMMdq_XMMdq_MEMdq',
-            'VFNMADD132PD_XMMdq_XMMdq_XMMdq',
-            'VFNMADD213PD_XMMdq_XMMdq_MEMdq',
-            'VFNMADD213PD_XMMdq_XMMdq_XMMdq',
-            'VFNMADD231PD_XMMdq_XMMdq_MEMdq',
-            'VFNMADD231PD_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB132PD_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB132PD_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB213PD_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB213PD_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB231PD_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB231PD_XMMdq_XMMdq_XMMdq'
-            ]
-        for cnt in fma_double_xmm:
-            if cnt in instruction_group_count:
-                total_double_fp += instruction_group_count[cnt] * 2
-                total_fmas += instruction_group_count[cnt]
-
-        fma_double_ymm = [
-            'VFMADD132PD_YMMqq_YMMqq_MEMqq',
-            'VFMADD132PD_YMMqq_YMMqq_YMMqq',
-            'VFMADD213PD_YMMqq_YMMqq_MEMqq',
-            'VFMADD213PD_YMMqq_YMMqq_YMMqq',
-            'VFMADD231PD_YMMqq_YMMqq_MEMqq',
-            'VFMADD231PD_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB132PD_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB132PD_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB213PD_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB213PD_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB231PD_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB231PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUB132PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUB132PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUB213PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUB213PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUB231PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUB231PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD132PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD132PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD213PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD213PD_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD231PD_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD231PD_YMMqq_YMMqq_YMMqq',
-            'VFNMADD132PD_YMMqq_YMMqq_MEMqq',
-            'VFNMADD132PD_YMMqq_YMMqq_YMMqq',
-            'VFNMADD213PD_YMMqq_YMMqq_MEMqq',
-            'VFNMADD213PD_YMMqq_YMMqq_YMMqq',
-            'VFNMADD231PD_YMMqq_YMMqq_MEMqq',
-            'VFNMADD231PD_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB132PD_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB132PD_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB213PD_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB213PD_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB231PD_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB231PD_YMMqq_YMMqq_YMMqq'
-            ]
-        for cnt in fma_double_ymm:
-            if cnt in instruction_group_count:
-                total_double_fp += instruction_group_count[cnt] * 4
-                total_fmas += instruction_group_count[cnt]
-
-        fma_double_scalar = [
-            'VFMADD132SD_XMMdq_XMMq_MEMq',
-            'VFMADD132SD_XMMdq_XMMq_XMMq',
-            'VFMADD213SD_XMMdq_XMMq_MEMq',
-            'VFMADD213SD_XMMdq_XMMq_XMMq',
-            'VFMADD231SD_XMMdq_XMMq_MEMq',
-            'VFMADD231SD_XMMdq_XMMq_XMMq',
-            'VFMSUB132SD_XMMdq_XMMq_MEMq',
-            'VFMSUB132SD_XMMdq_XMMq_XMMq',
-            'VFMSUB213SD_XMMdq_XMMq_MEMq',
-            'VFMSUB213SD_XMMdq_XMMq_XMMq',
-            'VFMSUB231SD_XMMdq_XMMq_MEMq',
-            'VFMSUB231SD_XMMdq_XMMq_XMMq',
-            'VFNMADD132SD_XMMdq_XMMq_MEMq',
-            'VFNMADD132SD_XMMdq_XMMq_XMMq',
-            'VFNMADD213SD_XMMdq_XMMq_MEMq',
-            'VFNMADD213SD_XMMdq_XMMq_XMMq',
-            'VFNMADD231SD_XMMdq_XMMq_MEMq',
-            'VFNMADD231SD_XMMdq_XMMq_XMMq',
-            'VFNMSUB132SD_XMMdq_XMMq_MEMq',
-            'VFNMSUB132SD_XMMdq_XMMq_XMMq',
-            'VFNMSUB213SD_XMMdq_XMMq_MEMq',
-            'VFNMSUB213SD_XMMdq_XMMq_XMMq',
-            'VFNMSUB231SD_XMMdq_XMMq_MEMq',
-            'VFNMSUB231SD_XMMdq_XMMq_XMMq'
-            ]
-        for cnt in fma_double_scalar:
-            if cnt in instruction_group_count:
-                total_double_fp += instruction_group_count[cnt]
-                total_fmas += instruction_group_count[cnt]
-
-        fma_single_xmm = [
-            'VFMADD132PS_XMMdq_XMMdq_MEMdq',
-            'VFMADD132PS_XMMdq_XMMdq_XMMdq',
-            'VFMADD213PS_XMMdq_XMMdq_MEMdq',
-            'VFMADD213PS_XMMdq_XMMdq_XMMdq',
-            'VFMADD231PS_XMMdq_XMMdq_MEMdq',
-            'VFMADD231PS_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB132PS_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB132PS_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB213PS_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB213PS_XMMdq_XMMdq_XMMdq',
-            'VFMADDSUB231PS_XMMdq_XMMdq_MEMdq',
-            'VFMADDSUB231PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUB132PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUB132PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUB213PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUB213PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUB231PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUB231PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD132PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD132PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD213PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD213PS_XMMdq_XMMdq_XMMdq',
-            'VFMSUBADD231PS_XMMdq_XMMdq_MEMdq',
-            'VFMSUBADD231PS_XMMdq_XMMdq_XMMdq',
-            'VFNMADD132PS_XMMdq_XMMdq_MEMdq',
-            'VFNMADD132PS_XMMdq_XMMdq_XMMdq',
-            'VFNMADD213PS_XMMdq_XMMdq_MEMdq',
-            'VFNMADD213PS_XMMdq_XMMdq_XMMdq',
-            'VFNMADD231PS_XMMdq_XMMdq_MEMdq',
-            'VFNMADD231PS_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB132PS_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB132PS_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB213PS_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB213PS_XMMdq_XMMdq_XMMdq',
-            'VFNMSUB231PS_XMMdq_XMMdq_MEMdq',
-            'VFNMSUB231PS_XMMdq_XMMdq_XMMdq'
-            ]
-        for cnt in fma_single_xmm:
-            if cnt in instruction_group_count:
-                total_single_fp += instruction_group_count[cnt] * 4
-                total_fmas += instruction_group_count[cnt]
-
-        fma_single_ymm = [
-            'VFMADD132PS_YMMqq_YMMqq_MEMqq',
-            'VFMADD132PS_YMMqq_YMMqq_YMMqq',
-            'VFMADD213PS_YMMqq_YMMqq_MEMqq',
-            'VFMADD213PS_YMMqq_YMMqq_YMMqq',
-            'VFMADD231PS_YMMqq_YMMqq_MEMqq',
-            'VFMADD231PS_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB132PS_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB132PS_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB213PS_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB213PS_YMMqq_YMMqq_YMMqq',
-            'VFMADDSUB231PS_YMMqq_YMMqq_MEMqq',
-            'VFMADDSUB231PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUB132PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUB132PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUB213PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUB213PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUB231PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUB231PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD132PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD132PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD213PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD213PS_YMMqq_YMMqq_YMMqq',
-            'VFMSUBADD231PS_YMMqq_YMMqq_MEMqq',
-            'VFMSUBADD231PS_YMMqq_YMMqq_YMMqq',
-            'VFNMADD132PS_YMMqq_YMMqq_MEMqq',
-            'VFNMADD132PS_YMMqq_YMMqq_YMMqq',
-            'VFNMADD213PS_YMMqq_YMMqq_MEMqq',
-            'VFNMADD213PS_YMMqq_YMMqq_YMMqq',
-            'VFNMADD231PS_YMMqq_YMMqq_MEMqq',
-            'VFNMADD231PS_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB132PS_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB132PS_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB213PS_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB213PS_YMMqq_YMMqq_YMMqq',
-            'VFNMSUB231PS_YMMqq_YMMqq_MEMqq',
-            'VFNMSUB231PS_YMMqq_YMMqq_YMMqq'
-            ]
-        for cnt in fma_single_ymm:
-            if cnt in instruction_group_count:
-                total_single_fp += instruction_group_count[cnt] * 8
-                total_fmas += instruction_group_count[cnt]
-
-        fma_single_scalar = [
-            'VFMADD132SS_XMMdq_XMMd_MEMd',
-            'VFMADD132SS_XMMdq_XMMd_XMMd',
-            'VFMADD213SS_XMMdq_XMMd_MEMd',
-            'VFMADD213SS_XMMdq_XMMd_XMMd',
-            'VFMADD231SS_XMMdq_XMMd_MEMd',
-            'VFMADD231SS_XMMdq_XMMd_XMMd',
-            'VFMSUB132SS_XMMdq_XMMd_MEMd',
-            'VFMSUB132SS_XMMdq_XMMd_XMMd',
-            'VFMSUB213SS_XMMdq_XMMd_MEMd',
-            'VFMSUB213SS_XMMdq_XMMd_XMMd',
-            'VFMSUB231SS_XMMdq_XMMd_MEMd',
-            'VFMSUB231SS_XMMdq_XMMd_XMMd',
-            'VFNMADD132SS_XMMdq_XMMd_MEMd',
-            'VFNMADD132SS_XMMdq_XMMd_XMMd',
-            'VFNMADD213SS_XMMdq_XMMd_MEMd',
-            'VFNMADD213SS_XMMdq_XMMd_XMMd',
-            'VFNMADD231SS_XMMdq_XMMd_MEMd',
-            'VFNMADD231SS_XMMdq_XMMd_XMMd',
-            'VFNMSUB132SS_XMMdq_XMMd_MEMd',
-            'VFNMSUB132SS_XMMdq_XMMd_XMMd',
-            'VFNMSUB213SS_XMMdq_XMMd_MEMd',
-            'VFNMSUB213SS_XMMdq_XMMd_XMMd',
-            'VFNMSUB231SS_XMMdq_XMMd_MEMd',
-            'VFNMSUB231SS_XMMdq_XMMd_XMMd'
-            ]
-        for cnt in fma_single_scalar:
-            if cnt in instruction_group_count:
-                total_single_fp += instruction_group_count[cnt]
-                total_fmas += instruction_group_count[cnt]
-
-        result.append([tid, os_tid, total_single_fp, total_double_fp,
-                       total_inst, total_fmas, total_written, total_read])
-    # end while
-    return result
+            total_double_fp += instruction_group_count[key] * cnt
+    for key, cnt in ELEMENTS_FP_SINGLE:
+        if key in instruction_group_count:
+            total_single_fp += instruction_group_count[key] * cnt
+
+    # Get total executed instructions...
+    total_inst = 0
+    key = b'*total'
+    if key in instruction_group_count:
+        total_inst = instruction_group_count[key]
+
+    # Get bytes written...
+    total_written = 0
+    key = b'*mem-write'
+    if key in instruction_group_count:
+        total_written = instruction_group_count[key]
+
+    # Get bytes read...
+    total_read = 0
+    key = b'*mem-read'
+    if key in instruction_group_count:
+        total_read = instruction_group_count[key]
+
+    # FMAs
+    for iform, count in instruction_group_count.items():
+        if iform in fma_flops_by_iform:
+            fma_flops = fma_flops_by_iform[iform]
+        else:
+            mobj = RE_MIX_FMA.match(iform)
+            fma_flops = mobj and FMA_FLOPS.get(mobj.group(1, 2, 3))
+            fma_flops_by_iform[iform] = fma_flops
+        if fma_flops:
+            total_double_fp += count * fma_flops[0]
+            total_single_fp += count * fma_flops[1]
+            total_fmas += count
+
+    return [tid, os_tid, total_single_fp, total_double_fp, total_inst,
+            total_fmas, total_written, total_read]
 
 
 def flops_dyn(dyn_file):
-    "Calculate the masked double/single FLOPS indicated in 'dyn_file'"
+    "Calculate the masked double/single FLOPS indicated in 'dyn_file' by TID"
     warn4FMA = True
     warnBF16 = True
-    lines = []
-    try:
-        with open(dyn_file, 'rt') as in_file:
-            for line in in_file:
-                lines.append(line)
-    except:
-        print("Error: File '%s' does not exist!\n" % dyn_file)
-        usage()
-        exit(1)
-
-    # Brief validity check whether it's the correct file type...
-    if not any(re.match(r'\s+<thread-number>', line)
-               for line in lines):
-        print("Error: File '%s' does not seem to be created from Intel SDE's "
-              "'-dyn_mask_profile' option!\n" % dyn_file)
-        usage()
-        exit(1)
-
-    tid_end = -1
-    result = []
-    while True:  # iterate over all threads
-        tid = -1
-        # Find start line for thread (tid_start)
-        tid_start = -1
-        for i in range(tid_end, len(lines)):
-            mobj = re.match(r'<thread>', lines[i])
-            if mobj:
-                tid_start = i
-                break
-        if (tid_start == -1):
-            break
-
-        # Find end line for thread (tid_end)
-        old_tid_end = tid_end
-        for i in range(tid_start, len(lines)):
-            mobj = re.match(r'</thread>', lines[i])
-            if mobj:
-                tid_end = i
-                break
-        if (old_tid_end == tid_end):
-            print("Error: </thread> not found!")
-            exit(1)
-
-        # Find line "<thread-number>" for TID
-        th_num = -1  # zero-based!
-        for i in range(tid_start, tid_end):
-            mobj = re.match(r'\s+<thread-number>\s+([0-9]+)\s+'
-                            r'</thread-number>', lines[i])
-            if mobj:
-                th_num = i
-                tid = int(mobj.group(1))
-                break
-        if th_num == -1:
-            print("Error: <thread-number> not found!")
-            exit(1)
-
-        # Find line "<summarytable>"
-        sum_line = -1  # zero-based!
-        for i in range(tid_start, tid_end):
-            mobj = re.match(r'\s+<summarytable>', lines[i])
-            if mobj:
-                sum_line = i
-                break
-        if sum_line == -1:
-            print("Error: <summarytable> not found!")
-            exit(1)
-
-        # Find line "</summarytable>"
-        endsum_line = -1  # zero-based!
-        for i in range(sum_line, tid_end):
-            mobj = re.match(r'\s+</summarytable>', lines[i])
-            if mobj:
-                endsum_line = i
-                break
-        if endsum_line == -1:
-            print("Error: </summarytable> not found!")
-            exit(1)
-
-        # Compute masked FLOPs below...
-        total_fmas = 0
-        total_single_fp = 0
-        total_double_fp = 0
-        total_single_fp_m = 0
-        total_double_fp_m = 0
-
-        # Read the masked instruction counts (comp_count) for "fp" types
-        for i in range(sum_line, endsum_line):
-            mobj = re.match(r'^\s+masked\s+mask\s+[0-9]+b\s+[0-9]+elem\s+'
-                            r'([0-9]+)b\s+fp\s+[|]\s+[0-9]+\s+([0-9]+)\s+'
-                            r'[0-9.]+$', lines[i])
-            if mobj:
-                fp_type_bits = int(mobj.group(1))  # 32 (single) or 64 (double)
-                if (fp_type_bits == 32):
-                    total_single_fp_m += int(mobj.group(2))  # comp_count
-                elif (fp_type_bits == 64):
-                    total_double_fp_m += int(mobj.group(2))  # comp_count
-                else:
-                    print("Error: Unkown element_s!")
+    in_file = open_sde_file(dyn_file)
+
+    # Compute masked FLOPs of all threads in a single pass
+    result = {}
+    is_dyn_file = False
+    state = DYN_SEARCH_THREAD
+    # Current thread and instruction details, reset at their start lines
+    tid = -1
+    has_summary = False
+    total_fmas = 0
+    total_single_fp = 0
+    total_double_fp = 0
+    total_single_fp_m = 0
+    total_double_fp_m = 0
+    disasm = b''
+    comp_count = -1
+    exec_count = -1
+    with in_file:
+        for line in in_file:
+            tag = line.lstrip()
+            if tag.startswith(b'<thread-number>'):
+                is_dyn_file = True
+                # Find line "<thread-number>" for TID
+                if state != DYN_SEARCH_THREAD and tid == -1:
+                    mobj = RE_DYN_THREAD_NUMBER.match(line)
+                    if mobj:
+                        tid = int(mobj.group(1))
+            elif state == DYN_SEARCH_THREAD:
+                # Find start line for thread
+                if line.startswith(b'<thread>'):
+                    tid = -1
+                    has_summary = False
+                    total_fmas = 0
+                    total_single_fp = 0
+                    total_double_fp = 0
+                    total_single_fp_m = 0
+                    total_double_fp_m = 0
+                    state = DYN_IN_THREAD
+            elif line.startswith(b'</thread>'):
+                # End line for thread
+                if tid == -1:
+                    if not is_dyn_file:
+                        break
+                    print("Error: <thread-number> not found!")
                     exit(1)
-
-        # Read the individual instruction details and find FMAs
-        idet_end = tid_start
-        while True:  # iterate over all instruction details
-            # Find start line for instruction details (idet_start)
-            idet_start = -1
-            for i in range(idet_end, tid_end):
-                mobj = re.match(r'\s+<instruction-details>', lines[i])
-                if mobj:
-                    idet_start = i
-                    break
-            if (idet_start == -1):
-                break
-
-            # Find end line for instruction details (idet_end)
-            old_idet_end = idet_end
-            for i in range(idet_start, tid_end):
-                mobj = re.match(r'\s+</instruction-details>', lines[i])
-                if mobj:
-                    idet_end = i
-                    break
-            if (old_idet_end == idet_end):
-                print("Error: </instruction-details> not found!")
-                exit(1)
-
-            # Identify if instruction is FMA (or FMS)
-            for i in range(idet_start, idet_end):
-                mobj = re.match(r'\s+<disassembly>\s+'
-                                r'(vf(m|nm)(add|sub)[0-9a-z]+)\s+', lines[i])
-                if mobj:
-                    # For each found, get computation count
-                    comp_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<computation-count>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            comp_count = int(mobjj.group(1))
-                            break
-                    # For each found, get execution count
-                    exec_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<execution-counts>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            exec_count = int(mobjj.group(1))
-                            break
-
-                    mobjm = re.match(r'\s+<disassembly>\s+'
-                                     r'vf.*(\{k[0-9]+\})', lines[i])
-                    is_masked = False
-                    if mobjm is not None:
-                        is_masked = True
+                if not has_summary:
+                    print("Error: <summarytable> not found!")
+                    exit(1)
+                if state == DYN_IN_SUMMARY:
+                    print("Error: </summarytable> not found!")
+                    exit(1)
+                if state == DYN_IN_IDET:
+                    print("Error: </instruction-details> not found!")
+                    exit(1)
+                # Only the first thread of a TID counts
+                result.setdefault(tid, [tid, total_single_fp_m,
+                                        total_double_fp_m, total_fmas,
+                                        total_single_fp, total_double_fp])
+                state = DYN_SEARCH_THREAD
+            elif state == DYN_IN_SUMMARY:
+                # Read the masked instruction counts (comp_count) for "fp"
+                # types until line "</summarytable>"
+                if tag.startswith(b'masked'):
+                    mobj = RE_DYN_MASKED_FP.match(line)
+                    if mobj:
+                        # 32 (single) or 64 (double)
+                        fp_type_bits = int(mobj.group(1))
+                        if (fp_type_bits == 32):
+                            total_single_fp_m += int(mobj.group(2))
+                        elif (fp_type_bits == 64):
+                            total_double_fp_m += int(mobj.group(2))
+                        else:
+                            print("Error: Unkown element_s!")
+                            exit(1)
+                elif tag.startswith(b'</summarytable>'):
+                    state = DYN_IN_THREAD
+            elif state == DYN_IN_THREAD:
+                # Find line "<summarytable>" or start line for instruction
+                # details
+                if tag.startswith(b'<instruction-details>'):
+                    disasm = b''
+                    comp_count = -1
+                    exec_count = -1
+                    state = DYN_IN_IDET
+                elif not has_summary and tag.startswith(b'<summarytable>'):
+                    has_summary = True
+                    state = DYN_IN_SUMMARY
+            elif tag.startswith(b'<disassembly>'):  # state == DYN_IN_IDET
+                if not disasm:
+                    disasm = line
+            elif tag.startswith(b'<computation-count>'):
+                if comp_count == -1:
+                    mobj = RE_DYN_COMP_COUNT.match(line)
+                    if mobj:
+                        comp_count = int(mobj.group(1))
+            elif tag.startswith(b'<execution-counts>'):
+                if exec_count == -1:
+                    mobj = RE_DYN_EXEC_COUNT.match(line)
+                    if mobj:
+                        exec_count = int(mobj.group(1))
+            elif tag.startswith(b'</instruction-details>'):
+                # End line for instruction details
+                state = DYN_IN_THREAD
+                if not disasm:
+                    continue
+                comp_count = max(comp_count, 0)
+                exec_count = max(exec_count, 0)
+
+                # Identify if instruction is FMA (or FMS), 4FMA or DPBF16 at
+                # once
+                mobj = RE_DYN_FP_DISASM.match(disasm)
+                if mobj is None:
+                    continue
+                mnemonic = mobj.group(mobj.lastindex)
+
+                if mobj.lastindex == 1:  # FMA (or FMS)
+                    is_masked = b'{k' in disasm  # e.g. "zmm0{k1}"
 
                     total_fmas += exec_count
-                    # For each found, distinguish single and double prec.
-                    if (mobj.group(1)[-1:] == "s"):
+                    # Distinguish single and double prec.
+                    if (mnemonic[-1:] == b"s"):
                         if is_masked:
                             total_single_fp_m += comp_count
                         else:
                             total_single_fp += comp_count
-                    elif (mobj.group(1)[-1:] == "d"):
+                    elif (mnemonic[-1:] == b"d"):
                         if is_masked:
                             total_double_fp_m += comp_count
                         else:
@@ -583,40 +397,15 @@ def flops_dyn(dyn_file):
                     else:
                         print("Error: Unknown FP type for FMA!")
                         exit(1)
-                    break
+                    continue
 
-            # Identify if instruction is 4FMA
-            for i in range(idet_start, idet_end):
-                mobj = re.match(r'\s+<disassembly>\s+'
-                                r'(v4f(m|nm)add[a-z]+)\s+', lines[i])
-                if mobj:
-                    # For each found, get computation count
-                    comp_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<computation-count>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            comp_count = int(mobjj.group(1))
-                            break
-                    # For each found, get execution count
-                    exec_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<execution-counts>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            exec_count = int(mobjj.group(1))
-                            break
-
-                    mobjm = re.match(r'\s+<disassembly>\s+'
-                                     r'v4f.*(\{k[0-9]+\})', lines[i])
-                    is_masked = False
-                    if mobjm is not None:
-                        is_masked = True
+                if mobj.lastindex == 2:  # 4FMA
+                    is_masked = b'{k' in disasm
 
                     total_fmas += 4 * exec_count
-                    # For each found, increase single prec. count.
+                    # Increase single prec. count.
                     # There is no double prec. support for this instruction.
-                    if (mobj.group(1)[-1:] == "s"):
+                    if (mnemonic[-1:] == b"s"):
                         # TODO:
                         # Once supported within Intel SDE, validate!
                         # Current Intel SDE 8.50 does not support 4FMA for
@@ -625,54 +414,29 @@ def flops_dyn(dyn_file):
                             total_single_fp_m += 3 * comp_count
                         else:
                             total_single_fp += 4 * comp_count
-
                         if warn4FMA:
                             print("Warning: 4FMA is currently experimental!")
                             warn4FMA = False
                     else:
                         print("Error: Unknown FP type for 4FMA!")
                         exit(1)
-                    break
-
-            # Identify if instruction is DPBF16
-            # Note:
-            # We only consider DP (dot product) instructions and ignore type
-            # converts (BF16 -> FP32)!
-            for i in range(idet_start, idet_end):
-                mobj = re.match(r'\s+<disassembly>\s+'
-                                r'(vdpbf16[a-z]+)\s+', lines[i])
-                if mobj:
-                    # For each found, get computation count
-                    comp_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<computation-count>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            comp_count = int(mobjj.group(1))
-                            break
-                    # For each found, get execution count
-                    exec_count = 0
-                    for j in range(idet_start, idet_end):
-                        mobjj = re.match(r'\s+<execution-counts>\s+'
-                                         r'([0-9]+)\s+', lines[j])
-                        if mobjj:
-                            exec_count = int(mobjj.group(1))
-                            break
+                    continue
 
+                # DPBF16
+                # Note:
+                # We only consider DP (dot product) instructions and ignore
+                # type converts (BF16 -> FP32)!
+                if mobj.lastindex == 3:
                     # This is a workaround since (current?) Intel SDE is
                     # inconsistent for BF16 instructions when differentiating
                     # between masked and un-masked versions. For other
                     # instructions, un-masked ones will be properly counted
                     # in the sde-mix-out.txt report, but BF16 ones are not.
-                    mobjm = re.match(r'\s+<disassembly>\s+'
-                                     r'vdpbf16.*(\{k[0-9]+\})', lines[i])
-                    is_masked = False
-                    if mobjm is not None:
-                        is_masked = True
+                    is_masked = b'{k' in disasm
 
-                    # For each found, increase single prec. count.
+                    # Increase single prec. count.
                     # There is no double prec. support for this instruction.
-                    if (mobj.group(1)[-1:] == "s"):
+                    if (mnemonic[-1:] == b"s"):
                         if is_masked:
                             total_single_fp_m += 3 * comp_count
                         else:
@@ -684,11 +448,71 @@ def flops_dyn(dyn_file):
                     else:
                         print("Error: Unknown FP type for DPBF16!")
                         exit(1)
-                    break
 
-        result.append([tid, total_single_fp_m, total_double_fp_m, total_fmas,
-                       total_single_fp, total_double_fp])
-    # end while
+    # Brief validity check whether it's the correct file type...
+    if not is_dyn_file:
+        wrong_sde_file(dyn_file, '-dyn_mask_profile')
+
+    if state != DYN_SEARCH_THREAD:
+        print("Error: </thread> not found!")
+        exit(1)
+
+    return result
+
+class TeeOutput(object):
+    "Write to 'out' and keep a copy of the text written"
+    def __init__(self, out):
+        self.out = out
+        self.text = []
+
+    def write(self, text):
+        self.out.write(text)
+        self.text.append(text)
+
+    def flush(self):
+        self.out.flush()
+
+
+def cached(parse, sde_file):
+    "Return 'parse(sde_file)', cached in directory $INTEL_SDE_FLOPS_CACHE"
+    cache_dir = os.environ.get('INTEL_SDE_FLOPS_CACHE')
+    if not cache_dir:
+        return parse(sde_file)
+    try:
+        stat = os.stat(sde_file)
+    except OSError:
+        return parse(sde_file)  # Let 'parse' report the error
+
+    # Results are valid as long as the file (and this script) is not changed
+    key = (__version__, os.path.getmtime(__file__),
+           getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+    path = os.path.abspath(sde_file)
+    if not isinstance(path, bytes):
+        path = path.encode('utf-8')
+    cache_file = os.path.join(cache_dir, '%s-%s.pkl' %
+                              (parse.__name__, hashlib.sha1(path).hexdigest()))
+    try:
+        with open(cache_file, 'rb') as in_file:
+            cached_key, output, result = pickle.load(in_file)
+        if cached_key == key:
+            sys.stdout.write(output)  # Repeat warnings of 'parse'
+            return result
+    except Exception:
+        pass  # No or invalid cache file
+
+    sys.stdout = TeeOutput(sys.stdout)
+    try:
+        result = parse(sde_file)
+    finally:
+        output = ''.join(sys.stdout.text)
+        sys.stdout = sys.stdout.out
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(cache_file, 'wb') as out_file:
+            pickle.dump((key, output, result), out_file, 2)
+    except Exception:
+        pass  # Caching is optional
     return result
 
 print("Version: %s" % __version__)
@@ -706,8 +530,8 @@ else:
     usage()
     exit(1)
 
-result_mix = flops_mix(file_sde_mix)
-result_dyn = flops_dyn(file_sde_dyn)
+result_mix = cached(flops_mix, file_sde_mix)
+result_dyn = cached(flops_dyn, file_sde_dyn)
 
 sum_single_flops = 0
 sum_double_flops = 0
@@ -715,39 +539,42 @@ sum_total_inst = 0
 sum_total_written = 0
 sum_total_read = 0
 sum_total_fmas = 0
-for i in range(0, len(result_mix)):
-    masked_idx = -1
-    for j in range(0, len(result_dyn)):
-        if (result_dyn[j][0] == result_mix[i][0]):
-            masked_idx = j
-            break
-    print("TID: %d (OS-TID: %d):" % (result_mix[i][0],
-                                     result_mix[i][1]))
-    sum_single_flops += result_mix[i][2] + result_dyn[i][4]
-    print("\tUnmasked single prec. FLOPs: %d" % (result_mix[i][2] +
-                                                 result_dyn[i][4]))
-    sum_single_flops += result_dyn[masked_idx][1]
-    print("\tMasked single prec. FLOPs: %d" % result_dyn[masked_idx][1])
-    sum_double_flops += result_mix[i][3] + result_dyn[i][5]
-    print("\tUnmasked double prec. FLOPs: %d" % (result_mix[i][3] +
-                                                 result_dyn[i][5]))
-    sum_double_flops += result_dyn[masked_idx][2]
-    print("\tMasked double prec. FLOPs: %d" % result_dyn[masked_idx][2])
-    sum_total_inst += result_mix[i][4]
-    print("\tInstructions executed: %d" % result_mix[i][4])
-    sum_total_fmas += (result_mix[i][5] + result_dyn[masked_idx][3])
-    print("\tFMA instructions executed: %d" % (result_mix[i][5] +
-                                               result_dyn[masked_idx][3]))
-    sum_total_written += result_mix[i][6]
-    print("\tTotal bytes written: %d" % result_mix[i][6])
-    sum_total_read += result_mix[i][7]
-    print("\tTotal bytes read: %d" % result_mix[i][7])
-    print("\tArithmetic intensity (approx.): %f (EXPERIMENTAL)" % ((result_mix[i][2] + result_dyn[i][4] + result_dyn[masked_idx][1] + result_mix[i][3] + result_dyn[i][5] + result_dyn[masked_idx][2])/float(result_mix[i][6] + result_mix[i][7])))
-print("=============================================\nSum:")
-print("\tSingle prec. FLOPs: %d" % sum_single_flops)
-print("\tDouble prec. FLOPs: %d" % sum_double_flops)
-print("\tTotal instructions executed: %d" % sum_total_inst)
-print("\tTotal FMA instructions executed: %d" % sum_total_fmas)
-print("\tTotal bytes written: %d" % sum_total_written)
-print("\tTotal bytes read: %d" % sum_total_read)
-print("\tTotal arithmetic intensity (approx.): %f (EXPERIMENTAL)" % ((sum_single_flops + sum_double_flops)/float(sum_total_written + sum_total_read)))
+for row_mix in result_mix:
+    # Threads without masked FLOPs are not listed
+    row_dyn = result_dyn.get(row_mix[0], [row_mix[0], 0, 0, 0, 0, 0])
+    single_flops = row_mix[2] + row_dyn[4]  # Unmasked
+    single_flops_m = row_dyn[1]  # Masked
+    double_flops = row_mix[3] + row_dyn[5]  # Unmasked
+    double_flops_m = row_dyn[2]  # Masked
+    fmas = row_mix[5] + row_dyn[3]
+    sum_single_flops += single_flops + single_flops_m
+    sum_double_flops += double_flops + double_flops_m
+    sum_total_inst += row_mix[4]
+    sum_total_fmas += fmas
+    sum_total_written += row_mix[6]
+    sum_total_read += row_mix[7]
+    # Write the report of a thread at once
+    report = [
+        "TID: %d (OS-TID: %d):" % (row_mix[0], row_mix[1]),
+        "\tUnmasked single prec. FLOPs: %d" % single_flops,
+        "\tMasked single prec. FLOPs: %d" % single_flops_m,
+        "\tUnmasked double prec. FLOPs: %d" % double_flops,
+        "\tMasked double prec. FLOPs: %d" % double_flops_m,
+        "\tInstructions executed: %d" % row_mix[4],
+        "\tFMA instructions executed: %d" % fmas,
+        "\tTotal bytes written: %d" % row_mix[6],
+        "\tTotal bytes read: %d" % row_mix[7],
+        "\tArithmetic intensity (approx.): %f (EXPERIMENTAL)" % ((single_flops + single_flops_m + double_flops + double_flops_m)/float(row_mix[6] + row_mix[7])),
+    ]
+    sys.stdout.write('\n'.join(report) + '\n')
+report = [
+    "=============================================\nSum:",
+    "\tSingle prec. FLOPs: %d" % sum_single_flops,
+    "\tDouble prec. FLOPs: %d" % sum_double_flops,
+    "\tTotal instructions executed: %d" % sum_total_inst,
+    "\tTotal FMA instructions executed: %d" % sum_total_fmas,
+    "\tTotal bytes written: %d" % sum_total_written,
+    "\tTotal bytes read: %d" % sum_total_read,
+    "\tTotal arithmetic intensity (approx.): %f (EXPERIMENTAL)" % ((sum_single_flops + sum_double_flops)/float(sum_total_written + sum_total_read)),
+]
+sys.stdout.write('\n'.join(report) + '\n')